@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-from importlib.metadata import PackageNotFoundError
-from importlib.metadata import version as _pkg_version
 from pathlib import Path
 
 
@@ -33,6 +31,10 @@ _pyproject_version = _read_pyproject_version()
 if _pyproject_version != "0.0.0":
     version = _pyproject_version
 else:
+    # importlib.metadata is slow to import, so it is only loaded when pyproject.toml is absent
+    from importlib.metadata import PackageNotFoundError
+    from importlib.metadata import version as _pkg_version
+
     try:
         version = _pkg_version("eap-test-suite")
     except PackageNotFoundError:
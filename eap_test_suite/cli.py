@@ -11,9 +11,10 @@ Key Features:
 - Clones the latest `eapol_test` source from the Hostapd repository and builds it if required.
 - Loads EAP authentication test configurations from a JSON file.
 - Runs EAP authentication tests against a RADIUS server and logs results.
-- Implements log rotation to prevent excessive log growth.
+- Implements log rotation to prevent excessive log growth, written from a background thread.
 - Validates the configuration file for required fields.
 - Supports command-line arguments for specifying a single EAP type and enabling debug mode.
+- Runs the configured EAP tests concurrently, with an optional cap on the number of workers.
 
 Requirements:
 - FreeRADIUS server set up and configured.
@@ -25,6 +26,7 @@ Usage:
 python3 -m eap_test_suite.cli --eap PEAP
 python3 -m eap_test_suite.cli  # Runs all configured EAP tests
 python3 -m eap_test_suite.cli --debug  # Enables debug logging
+python3 -m eap_test_suite.cli --jobs 2  # Runs at most two tests at a time
 eap-test-suite --debug  # After installation
 ```
 
@@ -37,14 +39,31 @@ import argparse
 import json
 import logging
 import os
+import queue
+import re
+import selectors
+import shlex
 import shutil
 import socket
 import subprocess
 import sys
-from dataclasses import dataclass
-from logging.handlers import RotatingFileHandler
+import time
+from collections.abc import Collection, Iterable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import cache, lru_cache
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from jsonschema import Draft7Validator
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib parser
+    from json import loads as json_loads
 
 # Paths
 PACKAGE_ROOT = Path(__file__).resolve().parent
@@ -66,32 +85,137 @@ DEPENDENCIES = [
     "gcc",
     "libssl-dev",
 ]  # Required system dependencies
+PACKAGE_MANAGERS = ("apt", "dnf", "pacman", "brew")  # Supported package managers, in lookup order
+BUILD_PACKAGES = {
+    "apt": ("libnl-3-dev", "libnl-genl-3-dev"),
+    "dnf": ("libnl3-devel",),
+    "pacman": ("libnl",),
+    "brew": ("pkg-config", "autoconf", "automake", "libtool", "openssl"),
+}  # Packages needed to build eapol_test, per package manager
+PACKAGE_QUERIES = {
+    "apt": (("dpkg-query", "-W", "-f=${Package} ${db:Status-Status}\n"), "installed"),
+    "dnf": (("rpm", "-q", "--queryformat=%{NAME} installed\n"), "installed"),
+    "pacman": (("pacman", "-Q"), None),
+    "brew": (("brew", "list", "--versions"), None),
+}  # Installed-package query and required status field, per package manager
+INSTALL_ATTEMPTS = 3  # Attempts per package installation command before giving up
+INSTALL_RETRY_DELAY = 2.0  # Seconds before the first retry; doubled after each failure
 EAPOL_TEST_PATH = Path("/usr/local/bin/eapol_test")  # Path to the compiled eapol_test binary
 HOSTAPD_REPO = "https://w1.fi/hostap.git"  # Git repository for hostapd source code
 HOSTAP_SOURCE_DIR = PROJECT_ROOT / "hostap"
-
-
-@dataclass(frozen=True)
+HOSTAP_SPARSE_PATHS = ("wpa_supplicant", "src")  # hostap subtrees needed to build eapol_test
+OUTPUT_CHUNK_SIZE = 64 * 1024  # Bytes read from eapol_test output pipes per call
+RMTREE_WORKERS = 8  # Threads used to unlink files when removing the hostap checkout
+REACHABILITY_TIMEOUT = 1.0  # Seconds to wait for the RADIUS server to accept a connection
+REQUIRED_BUILD_CONFIGS = (
+    "CONFIG_EAPOL_TEST=y\n",
+    "CONFIG_TLS=openssl\n",
+    "CONFIG_TLSV11=y\n",
+    "CONFIG_TLSV12=y\n",
+    "CONFIG_TLSV13=y\n",  # Ensure TLS 1.3 support
+    "CONFIG_TLS_FUNCS=y\n",
+    "CONFIG_OSX=y\n",  # Ensure macOS build compatibility
+)  # Options appended to the eapol_test build configuration when missing
+KAY_BYTEORDER_SHIM = (
+    "#ifdef __APPLE__\n#include <libkern/OSByteOrder.h>\n#define bswap_64(x) OSSwapInt64(x)\n"
+    "#else\n#include <byteswap.h>\n#endif\n#include <stddef.h>\n"
+)  # Replaces the stddef.h include in ieee802_1x_kay.c
+
+CONFIG_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "required": ["radius", "eap_types"],
+    "properties": {
+        "radius": {"$ref": "#/definitions/radius"},
+        "eap_types": {"$ref": "#/definitions/eap_types"},
+    },
+    "definitions": {
+        "radius": {
+            "type": "object",
+            "required": ["server", "port", "secret"],
+            "properties": {
+                "server": {"type": "string"},
+                "port": {"type": "integer"},
+                "secret": {"type": "string"},
+            },
+            "additionalProperties": False,
+        },
+        "eap_types": {
+            "type": "object",
+            # In the case of no EAP-specific config, an entry is an empty dictionary
+            "additionalProperties": {"type": "object"},
+        },
+    },
+}  # Structure of CONFIG_FILE, mirroring RadiusConfig and EAPTypeConfig
+
+
+@dataclass(frozen=True, slots=True)
 class RadiusConfig:
     server: str
     port: int
     secret: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EAPTypeConfig:
     name: str
-    settings: dict[str, Any]
+    settings: Mapping[str, Any]
+    _conf_path: Path = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Resolved once at construction; frozen dataclasses need object.__setattr__
+        object.__setattr__(self, "_conf_path", CONFIG_DIR / f"{self.name}.conf")
 
     @property
     def conf_path(self) -> Path:
-        return CONFIG_DIR / f"{self.name}.conf"
+        return self._conf_path
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TestConfig:
     radius: RadiusConfig
-    eap_types: dict[str, EAPTypeConfig]
+    eap_types: Mapping[str, EAPTypeConfig]
+
+
+@dataclass(frozen=True, slots=True)
+class EAPTestResult:
+    eap_type: str
+    passed: bool
+    returncode: int | None = None
+
+
+class SizeTrackingRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that keeps track of the log file size itself.
+
+    The stock handler asks the open stream for its position on every record to decide whether
+    to roll over. This subclass reads the position once when the file is opened and then adds
+    the encoded length of each formatted record, so the filesystem is only consulted again when a
+    rollover is actually due.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._size: int | None = None
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:  # noqa: N802
+        if self.maxBytes <= 0:
+            return False
+        if self._size is None:
+            if self.stream is None:
+                self.stream = self._open()
+            self._size = self.stream.tell()
+        # Count encoded bytes, not characters, so non-ASCII output cannot push files past maxBytes
+        msg = self.format(record) + self.terminator
+        record_size = len(msg.encode(self.encoding or "utf-8", errors="replace"))
+        if self._size and self._size + record_size >= self.maxBytes:
+            # Never roll over anything other than a regular file (bpo-45401)
+            if os.path.exists(self.baseFilename) and not os.path.isfile(self.baseFilename):
+                self._size += record_size
+                return False
+            self._size = record_size
+            return True
+        self._size += record_size
+        return False
 
 
 def setup_logging(log_file):
@@ -99,37 +223,64 @@ def setup_logging(log_file):
     Configures logging with file rotation and console output.
 
     This function sets up the logging configuration to log messages to a file with rotation and
-    to the console. It ensures that the log directory exists, configures a rotating file handler,
-    and sets the logging format and level.
+    to the console. It ensures that the log directory exists, and routes records through an
+    unbounded queue to a background listener thread that owns the rotating file handler and the
+    console handler, so callers never wait on disk I/O.
 
     Args:
         log_file (Path): The path to the log file.
 
+    Returns:
+        QueueListener: The running listener. It is stopped by cleanup().
+
     Logging:
         - Logs are saved to the specified file with rotation.
         - Logs are also printed to the console.
     """
+    # Skip collecting record attributes the format never uses, including the caller lookup
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging._srcfile = None
+
     # Ensure the log directory exists
     log_file.parent.mkdir(parents=True, exist_ok=True)
 
-    # Configure a rotating file handler for logging
-    handler = RotatingFileHandler(log_file, maxBytes=MAX_LOG_SIZE, backupCount=LOG_RETENTION_COUNT)
+    # One formatter shared by both handlers; the explicit datefmt drops the millisecond suffix
+    formatter = logging.Formatter(
+        "%(asctime)s [%(levelname)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
+    )
 
-    # Set up basic logging configuration with file rotation and console output
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(message)s",
-        handlers=[handler, logging.StreamHandler(sys.stdout)],
+    # Configure a rotating file handler for logging
+    file_handler = SizeTrackingRotatingFileHandler(
+        log_file, maxBytes=MAX_LOG_SIZE, backupCount=LOG_RETENTION_COUNT
     )
+    file_handler.setFormatter(formatter)
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(formatter)
 
+    # Hand records to the listener thread through an unbounded queue so producers never block
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(-1)
+    listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.listener = listener
 
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(queue_handler)
+    listener.start()
+    return listener
+
+
+@cache
 def detect_package_manager():
     """
     Detects the system's package manager and returns its command name.
 
     This function checks for the presence of common package managers such as apt, dnf, pacman, and brew.
     If a supported package manager is found, its command name is returned. If no supported package manager
-    is found, an error is logged and the script exits.
+    is found, an error is logged and the script exits. The result is cached for the life of the process.
 
     Returns:
         str: The command name of the detected package manager.
@@ -137,27 +288,74 @@ def detect_package_manager():
     Logs:
         - Error if no supported package manager is found.
     """
-    for manager in ["apt", "dnf", "pacman", "brew"]:
+    for manager in PACKAGE_MANAGERS:
         if shutil.which(manager):
             return manager
     logging.error("No supported package manager found. Install dependencies manually.")
     sys.exit(1)
 
 
-def is_package_installed(package_name):
+def find_missing_packages(package_manager: str, packages: Sequence[str]) -> list[str]:
     """
-    Checks if a given package is installed on the system.
+    Determines which of the given packages are not installed.
 
-    This function uses the shutil.which() method to determine if the specified package is available
-    on the system's PATH.
+    All packages are checked with a single query against the package manager's database, rather
+    than guessing a binary name for each package and searching PATH for it.
 
     Args:
-        package_name (str): The name of the package to check.
+        package_manager (str): The detected package manager.
+        packages (Sequence[str]): Package names as understood by that package manager.
 
     Returns:
-        bool: True if the package is installed, False otherwise.
+        list[str]: The packages that still need to be installed, in their original order.
+    """
+    if not packages:
+        return []
+
+    query, installed_marker = PACKAGE_QUERIES[package_manager]
+    try:
+        result = subprocess.run([*query, *packages], capture_output=True, text=True)
+    except OSError as e:
+        logging.warning("Could not query installed packages: %s", e)
+        return list(packages)
+
+    # Each query prints "<name> <version-or-status>" per package; failures for unknown
+    # packages go to stderr or never name a requested package, so they drop out below
+    installed = set()
+    for line in result.stdout.splitlines():
+        fields = line.split()
+        if len(fields) >= 2 and installed_marker in (None, fields[-1]):
+            installed.add(fields[0])
+    return [package for package in packages if package not in installed]
+
+
+def run_with_retries(command: list[str]) -> None:
     """
-    return shutil.which(package_name) is not None
+    Runs a package manager command, retrying transient failures with exponential backoff.
+
+    Args:
+        command (list[str]): The command to run.
+
+    Raises:
+        subprocess.CalledProcessError: If every attempt fails.
+    """
+    for attempt in range(1, INSTALL_ATTEMPTS + 1):
+        try:
+            subprocess.run(command, check=True)
+            return
+        except subprocess.CalledProcessError as e:
+            if attempt == INSTALL_ATTEMPTS:
+                raise
+            delay = INSTALL_RETRY_DELAY * 2 ** (attempt - 1)
+            logging.warning(
+                "%s failed (attempt %d of %d), retrying in %.0fs: %s",
+                command[0],
+                attempt,
+                INSTALL_ATTEMPTS,
+                delay,
+                e,
+            )
+            time.sleep(delay)
 
 
 def install_dependencies():
@@ -173,38 +371,28 @@ def install_dependencies():
         - Error messages if dependency installation fails.
     """
     package_manager = detect_package_manager()
-
-    packages = []
-    if package_manager == "apt":
-        packages = ["libnl-3-dev", "libnl-genl-3-dev"]
-    elif package_manager == "dnf":
-        packages = ["libnl3-devel"]
-    elif package_manager == "pacman":
-        packages = ["libnl"]
-    elif package_manager == "brew":
-        packages = ["pkg-config", "autoconf", "automake", "libtool", "openssl"]
-
-    packages_to_install = []
-    for p in packages:
-        base_package = p.split("-")[0]  # Split to remove -dev or -devel
-        if not is_package_installed(base_package):
-            packages_to_install.append(p)
+    packages_to_install = find_missing_packages(package_manager, BUILD_PACKAGES[package_manager])
 
     if packages_to_install:
         try:
             if package_manager == "apt":
-                subprocess.run(["sudo", "apt-get", "update"], check=True)
-                subprocess.run(
-                    ["sudo", "apt-get", "install", "-y", *packages_to_install], check=True
+                # Refresh the index and install in one privileged shell rather than two launches
+                quoted = " ".join(shlex.quote(package) for package in packages_to_install)
+                run_with_retries(
+                    [
+                        "sudo",
+                        "sh",
+                        "-c",
+                        "apt-get update && DEBIAN_FRONTEND=noninteractive "
+                        f"apt-get install -y {quoted}",
+                    ]
                 )
             elif package_manager == "dnf":
-                subprocess.run(["sudo", "dnf", "install", "-y", *packages_to_install], check=True)
+                run_with_retries(["sudo", "dnf", "install", "-y", *packages_to_install])
             elif package_manager == "pacman":
-                subprocess.run(
-                    ["sudo", "pacman", "-Sy", "--noconfirm", *packages_to_install], check=True
-                )
+                run_with_retries(["sudo", "pacman", "-Sy", "--noconfirm", *packages_to_install])
             elif package_manager == "brew":
-                subprocess.run(["brew", "install", *packages_to_install], check=True)
+                run_with_retries(["brew", "install", *packages_to_install])
         except subprocess.CalledProcessError as e:
             logging.error(f"Dependency installation failed: {e}")
             sys.exit(1)
@@ -225,6 +413,54 @@ def install_dependencies():
             sys.exit(1)
 
 
+def patch_build_config(config_path: Path) -> str:
+    """
+    Adjusts the wpa_supplicant build configuration for eapol_test.
+
+    The file is read once, the libnl and OpenSSL lines are rewritten with regular expressions,
+    any missing required options are appended, and the result is written back in a single call.
+
+    Args:
+        config_path (Path): The .config file copied from defconfig.
+
+    Returns:
+        str: The updated configuration text.
+    """
+    text = config_path.read_text()
+    text = re.sub(r"^[ \t]*CONFIG_LIBNL32=y[ \t]*$", "# CONFIG_LIBNL32=y", text, flags=re.MULTILINE)
+    text = re.sub(
+        r"^.*CFLAGS \+= -I/usr/local/openssl/include.*$",
+        "CFLAGS += -I/opt/homebrew/opt/openssl/include/openssl",
+        text,
+        flags=re.MULTILINE,
+    )
+    text = re.sub(
+        r"^.*LIBS \+= -L/usr/local/openssl/lib.*$",
+        "LIBS += -L/opt/homebrew/opt/openssl/lib -lssl -lcrypto",
+        text,
+        flags=re.MULTILINE,
+    )
+    if text and not text.endswith("\n"):
+        text += "\n"
+
+    # Ensure necessary options are set
+    existing = set(text.splitlines(keepends=True))
+    text += "".join(config for config in REQUIRED_BUILD_CONFIGS if config not in existing)
+    config_path.write_text(text)
+    return text
+
+
+def patch_kay_source(src_file: Path) -> None:
+    """
+    Makes ieee802_1x_kay.c use OSByteOrder.h for bswap_64 on macOS.
+
+    Args:
+        src_file (Path): The ieee802_1x_kay.c source file.
+    """
+    source = src_file.read_text()
+    src_file.write_text(source.replace("#include <stddef.h>\n", KAY_BYTEORDER_SHIM))
+
+
 def build_eapol_test():
     """
     Clones and builds `eapol_test` from the Hostapd repository if it is not already available.
@@ -240,16 +476,31 @@ def build_eapol_test():
     # Clean previous build artifacts
     logging.info("Cleaning previous build artifacts...")
     if HOSTAP_SOURCE_DIR.exists():
-        shutil.rmtree(HOSTAP_SOURCE_DIR)
+        fast_rmtree(HOSTAP_SOURCE_DIR)
 
     logging.info("Cloning and building eapol_test from source...")
 
     try:
+        # Shallow, blobless, sparse clone: only the sources eapol_test needs are materialized
         subprocess.run(
-            ["git", "clone", HOSTAPD_REPO, str(HOSTAP_SOURCE_DIR)],
+            [
+                "git",
+                "clone",
+                "--depth",
+                "1",
+                "--filter=blob:none",
+                "--sparse",
+                HOSTAPD_REPO,
+                str(HOSTAP_SOURCE_DIR),
+            ],
             check=True,
             cwd=PROJECT_ROOT,
         )
+        subprocess.run(
+            ["git", "sparse-checkout", "set", *HOSTAP_SPARSE_PATHS],
+            check=True,
+            cwd=HOSTAP_SOURCE_DIR,
+        )
         hostapd_dir = HOSTAP_SOURCE_DIR / "wpa_supplicant"
 
         if hostapd_dir.exists():
@@ -260,58 +511,23 @@ def build_eapol_test():
             shutil.copy(defconfig_path, config_path)
 
             # Modify the .config file
-            with config_path.open("r") as config_file:
-                config_lines = config_file.readlines()
-
-            with config_path.open("w") as config_file:
-                for line in config_lines:
-                    if line.strip() == "CONFIG_LIBNL32=y":
-                        config_file.write("# CONFIG_LIBNL32=y\n")
-                    elif "CFLAGS += -I/usr/local/openssl/include" in line:
-                        config_file.write("CFLAGS += -I/opt/homebrew/opt/openssl/include/openssl\n")
-                    elif "LIBS += -L/usr/local/openssl/lib" in line:
-                        config_file.write(
-                            "LIBS += -L/opt/homebrew/opt/openssl/lib -lssl -lcrypto\n"
-                        )
-                    else:
-                        config_file.write(line)
-
-                # Ensure necessary options are set
-                required_configs = [
-                    "CONFIG_EAPOL_TEST=y\n",
-                    "CONFIG_TLS=openssl\n",
-                    "CONFIG_TLSV11=y\n",
-                    "CONFIG_TLSV12=y\n",
-                    "CONFIG_TLSV13=y\n",  # Ensure TLS 1.3 support
-                    "CONFIG_TLS_FUNCS=y\n",
-                    "CONFIG_OSX=y\n",  # Ensure macOS build compatibility
-                ]
-
-                for config in required_configs:
-                    if config not in config_lines:
-                        config_file.write(config)
+            config_text = patch_build_config(config_path)
 
             logging.info("Updated .config file:")
-            with config_path.open("r") as config_file:
-                logging.info(config_file.read())
+            logging.info(config_text)
 
             # Modify ieee802_1x_kay.c to include OSByteOrder.h for macOS compatibility
-            src_file = hostapd_dir / "../src/pae/ieee802_1x_kay.c"
-            with src_file.open("r") as file:
-                lines = file.readlines()
-            with src_file.open("w") as file:
-                for line in lines:
-                    if line.strip() == "#include <stddef.h>":
-                        file.write(
-                            "#ifdef __APPLE__\n#include <libkern/OSByteOrder.h>\n#define bswap_64(x) OSSwapInt64(x)\n#else\n#include <byteswap.h>\n#endif\n"
-                        )
-                    file.write(line)
+            patch_kay_source(hostapd_dir / "../src/pae/ieee802_1x_kay.c")
 
+            build_jobs = str(os.cpu_count() or 4)
             env = os.environ.copy()
             env.setdefault("PKG_CONFIG_PATH", "/opt/homebrew/opt/openssl/lib/pkgconfig")
+            env["MAKEFLAGS"] = f"-j{build_jobs}"  # Recursive makes inherit the parallelism
 
             # Build eapol_test
-            subprocess.run(["make", "eapol_test"], cwd=hostapd_dir, env=env, check=True)
+            subprocess.run(
+                ["make", f"-j{build_jobs}", "eapol_test"], cwd=hostapd_dir, env=env, check=True
+            )
             shutil.move(str(hostapd_dir / "eapol_test"), str(EAPOL_TEST_PATH))
             logging.info("eapol_test successfully built and installed.")
         else:
@@ -322,13 +538,42 @@ def build_eapol_test():
         sys.exit(1)
 
 
+@cache
+def schema_validator(section: str | None = None) -> Draft7Validator:
+    """
+    Compiles CONFIG_SCHEMA, or one of its definitions, into a validator on first use.
+
+    jsonschema is imported here rather than at module level so that code paths which never load
+    a configuration (such as --help) do not pay for importing it.
+
+    Args:
+        section (str | None): A key of CONFIG_SCHEMA["definitions"], or None for the whole schema.
+
+    Returns:
+        Draft7Validator: The compiled validator, reused by later calls.
+    """
+    from jsonschema import Draft7Validator, validators
+
+    # Draft 7 accepts 1812.0 as an integer; require a real int so ports reach eapol_test intact
+    type_checker = Draft7Validator.TYPE_CHECKER.redefine(
+        "integer",
+        lambda _checker, instance: isinstance(instance, int) and not isinstance(instance, bool),
+    )
+    validator_class = validators.extend(Draft7Validator, type_checker=type_checker)
+
+    if section is None:
+        validator_class.check_schema(CONFIG_SCHEMA)
+        return validator_class(CONFIG_SCHEMA)
+    return validator_class(CONFIG_SCHEMA["definitions"][section])
+
+
 def validate_radius_config(data):
     """
     Validates the radius configuration dictionary.
 
-    This function checks if the given data is a dictionary and contains the required keys
-    ("server", "port", "secret"). It also verifies that the values for these keys are of
-    the correct data types.
+    This function checks the data against the radius section of CONFIG_SCHEMA: it must be a
+    dictionary holding exactly the keys "server", "port" and "secret", with string, integer and
+    string values respectively.
 
     Args:
         data (dict): The radius configuration data to validate.
@@ -336,25 +581,16 @@ def validate_radius_config(data):
     Returns:
         bool: True if the configuration is valid, False otherwise.
     """
-    if not isinstance(data, dict):
-        return False
-    if not all(key in data for key in ["server", "port", "secret"]):
-        return False
-    if (
-        not isinstance(data["server"], str)
-        or not isinstance(data["port"], int)
-        or not isinstance(data["secret"], str)
-    ):
-        return False
-    return True
+    return schema_validator("radius").is_valid(data)
 
 
 def validate_eap_types_config(data):
     """
     Validates the eap_types configuration dictionary.
 
-    This function checks if the given data is a dictionary and ensures that each EAP type
-    configuration within it is also a dictionary (which may be empty in some cases).
+    This function checks the data against the eap_types section of CONFIG_SCHEMA: it must be a
+    dictionary, and each EAP type configuration within it must also be a dictionary (which may be
+    empty in some cases).
 
     Args:
         data (dict): The eap_types configuration data to validate.
@@ -362,14 +598,47 @@ def validate_eap_types_config(data):
     Returns:
         bool: True if the configuration is valid, False otherwise.
     """
-    if not isinstance(data, dict):
-        return False
-    for _eap_type, eap_data in data.items():
-        if not isinstance(
-            eap_data, dict
-        ):  # In the case of no EAP-specific config, this will be an empty dictionary.
-            return False
-    return True
+    return schema_validator("eap_types").is_valid(data)
+
+
+@lru_cache(maxsize=4)
+def parse_config_file(path: Path, mtime_ns: int, size: int) -> TestConfig:
+    """
+    Parses and validates a configuration file, memoized on its path, modification time and size.
+
+    The modification time and size are part of the cache key, so an edited file is parsed again
+    (even within the filesystem's timestamp granularity, as long as its size changed) while
+    repeated loads of an unchanged file return the same TestConfig without touching its contents.
+    Every caller shares that TestConfig, so its eap_types mapping is read-only.
+
+    Args:
+        path (Path): The configuration file.
+        mtime_ns (int): The file's modification time in nanoseconds.
+        size (int): The file's size in bytes.
+
+    Returns:
+        TestConfig: The validated configuration.
+
+    Raises:
+        ValueError: If the configuration structure or content is invalid.
+        json.JSONDecodeError: If there is an error parsing the configuration file.
+    """
+    data = json_loads(path.read_bytes())
+
+    from jsonschema import ValidationError
+
+    # A single validation pass covers the top-level shape, radius and eap_types
+    try:
+        schema_validator().validate(data)
+    except ValidationError as e:
+        raise ValueError(f"Invalid configuration: {e.message}") from e
+
+    radius_config = RadiusConfig(**data["radius"])
+    eap_types = {
+        eap_type: EAPTypeConfig(name=eap_type, settings=MappingProxyType(eap_data))
+        for eap_type, eap_data in data["eap_types"].items()
+    }
+    return TestConfig(radius=radius_config, eap_types=MappingProxyType(eap_types))
 
 
 def load_config() -> TestConfig:
@@ -378,7 +647,8 @@ def load_config() -> TestConfig:
 
     This function reads the configuration data from a JSON file, validates the structure and content,
     and returns the validated configuration. It raises an error and exits the script if the configuration
-    is invalid or if any required keys are missing.
+    is invalid or if any required keys are missing. Parsing is delegated to parse_config_file(), so
+    loading an unchanged file again reuses the previous result.
 
     Raises:
         ValueError: If the configuration structure or content is invalid.
@@ -386,42 +656,61 @@ def load_config() -> TestConfig:
         json.JSONDecodeError: If there is an error parsing the configuration file.
     """
     try:
-        with CONFIG_FILE.open("r", encoding="utf-8") as config_file:
-            data = json.load(config_file)
+        stat = CONFIG_FILE.stat()
+        config = parse_config_file(CONFIG_FILE, stat.st_mtime_ns, stat.st_size)
+    except (ValueError, FileNotFoundError, json.JSONDecodeError) as e:
+        logging.error(f"Failed to load configuration: {e}")
+        sys.exit(1)
 
-        if not isinstance(data, dict) or "radius" not in data or "eap_types" not in data:
-            raise ValueError("Invalid configuration structure.")
+    logging.info("Configuration loaded successfully.")
+    return config
 
-        if not validate_radius_config(data["radius"]):
-            raise ValueError("Invalid radius configuration.")
 
-        if not validate_eap_types_config(data["eap_types"]):
-            raise ValueError("Invalid eap_types configuration.")
+def scan_conf_files(directories: Iterable[Path]) -> frozenset[Path]:
+    """
+    Lists the EAP .conf files present in the given directories.
 
-        radius_config = RadiusConfig(**data["radius"])
-        eap_types = {
-            eap_type: EAPTypeConfig(name=eap_type, settings=dict(eap_data))
-            for eap_type, eap_data in data["eap_types"].items()
-        }
+    Each directory is read with a single os.scandir pass, which reports file types from the
+    directory listing itself, instead of stat'ing every expected file separately.
 
-        logging.info("Configuration loaded successfully.")
-        return TestConfig(radius=radius_config, eap_types=eap_types)
+    Args:
+        directories (Iterable[Path]): Directories to scan. Missing directories are skipped.
 
-    except (ValueError, FileNotFoundError, json.JSONDecodeError) as e:
-        logging.error(f"Failed to load configuration: {e}")
-        sys.exit(1)
+    Returns:
+        frozenset[Path]: Paths of the .conf files found.
+    """
+    found: set[Path] = set()
+    for directory in directories:
+        try:
+            with os.scandir(directory) as entries:
+                found.update(
+                    directory / entry.name
+                    for entry in entries
+                    if entry.name.endswith(".conf") and entry.is_file()
+                )
+        except FileNotFoundError:
+            continue
+    return frozenset(found)
 
 
-def execute_eapol_test(config: TestConfig, eap_type: str) -> None:
+def execute_eapol_test(
+    config: TestConfig, eap_type: str, conf_files: Collection[Path] | None = None
+) -> EAPTestResult:
     """
     Executes eapol_test for the specified EAP type.
 
     This function runs the eapol_test command for a given EAP type using the configuration
-    parameters from the provided config dictionary. It logs the results of the test.
+    parameters from the provided config dictionary. It logs the results of the test and
+    returns them so callers running several tests can aggregate the outcome.
 
     Args:
         config (TestConfig): The configuration data loaded from the JSON file.
         eap_type (str): The EAP type to test.
+        conf_files (Collection[Path] | None): Known .conf files, as returned by
+            scan_conf_files(). When omitted, the EAP type's file is checked on disk.
+
+    Returns:
+        EAPTestResult: Whether the test passed and the eapol_test return code, if it ran.
 
     Logs:
         - Info messages indicating whether the test passed.
@@ -430,12 +719,16 @@ def execute_eapol_test(config: TestConfig, eap_type: str) -> None:
     eap_config = config.eap_types.get(eap_type)
     if eap_config is None:
         logging.error(f"EAP type {eap_type} is not configured.")
-        return
+        return EAPTestResult(eap_type, passed=False)
 
     config_file = eap_config.conf_path
-    if not config_file.exists():
+    if conf_files is None:
+        conf_present = config_file.exists()
+    else:
+        conf_present = config_file in conf_files
+    if not conf_present:
         logging.error("Configuration file %s not found for EAP type %s.", config_file, eap_type)
-        return
+        return EAPTestResult(eap_type, passed=False)
 
     radius = config.radius
 
@@ -449,20 +742,124 @@ def execute_eapol_test(config: TestConfig, eap_type: str) -> None:
         f"-s{radius.secret}",
         f"-c{config_file}",
     ]
+    # Launched by absolute path with no preexec_fn, cwd, start_new_session or pass_fds, so
+    # CPython can use posix_spawn (or vfork) instead of fork, even from many worker threads
     try:
-        result = subprocess.run(command, capture_output=True, text=True)
-        if result.returncode == 0:
-            logging.info("EAP type %s test passed.", eap_type)
-            if result.stdout:
-                logging.debug(result.stdout)
-        else:
-            logging.error(
-                "EAP type %s test failed with return code: %s", eap_type, result.returncode
-            )
-            if result.stderr:
-                logging.error(result.stderr)
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     except OSError as e:
         logging.error("EAP type %s test failed to execute: %s", eap_type, e)
+        return EAPTestResult(eap_type, passed=False)
+
+    with process:
+        stderr_lines = stream_process_output(process, eap_type)
+        returncode = process.wait()
+
+    if returncode == 0:
+        logging.info("EAP type %s test passed.", eap_type)
+    else:
+        logging.error("EAP type %s test failed with return code: %s", eap_type, returncode)
+        if stderr_lines:
+            logging.error("%s: %s", eap_type, "\n".join(stderr_lines))
+    return EAPTestResult(eap_type, passed=returncode == 0, returncode=returncode)
+
+
+def stream_process_output(process: subprocess.Popen[bytes], eap_type: str) -> list[str]:
+    """
+    Logs the output of a running eapol_test process line by line as it arrives.
+
+    Both streams are logged at debug level while the process runs, and standard error is also
+    kept so the caller can report it at error level if the test fails. Both pipes are
+    multiplexed with a selector and read in raw chunks, so standard output is never held in
+    memory beyond its longest line.
+
+    Args:
+        process (subprocess.Popen): The process, started with both output streams piped.
+        eap_type (str): The EAP type under test, used to prefix each logged line.
+
+    Returns:
+        list[str]: The decoded standard error lines.
+    """
+    pending: dict[int, bytes] = {}
+    stderr_lines: list[str] = []
+    with selectors.DefaultSelector() as selector:
+        for stream, kept in ((process.stdout, None), (process.stderr, stderr_lines)):
+            if stream is not None:
+                selector.register(stream, selectors.EVENT_READ, kept)
+                pending[stream.fileno()] = b""
+
+        while selector.get_map():
+            for key, _events in selector.select():
+                chunk = os.read(key.fd, OUTPUT_CHUNK_SIZE)
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                    remainder = pending.pop(key.fd)
+                    lines = [remainder] if remainder else []
+                else:
+                    *lines, pending[key.fd] = (pending[key.fd] + chunk).split(b"\n")
+                for line in lines:
+                    text = line.decode("utf-8", errors="replace").rstrip()
+                    logging.debug("%s: %s", eap_type, text)
+                    if key.data is not None:
+                        key.data.append(text)
+    return stderr_lines
+
+
+def run_eap_tests(
+    config: TestConfig, eap_types: list[str], jobs: int | None = None
+) -> list[EAPTestResult]:
+    """
+    Runs eapol_test for several EAP types concurrently.
+
+    Each test is an independent eapol_test process that spends its time waiting on the
+    RADIUS server, so the tests are dispatched to a thread pool rather than run one after
+    another. Results are returned in the order of ``eap_types``.
+
+    Args:
+        config (TestConfig): The configuration data loaded from the JSON file.
+        eap_types (list[str]): The EAP types to test.
+        jobs (int | None): Maximum number of tests to run at once. Defaults to twice the
+            number of CPUs, capped at the number of tests.
+
+    Returns:
+        list[EAPTestResult]: One result per requested EAP type.
+    """
+    if not eap_types:
+        return []
+
+    # List the .conf files once up front rather than stat'ing one per worker
+    conf_files = scan_conf_files(
+        {eap_config.conf_path.parent for eap_config in config.eap_types.values()}
+    )
+
+    max_workers = jobs or (os.cpu_count() or 1) * 2
+    with ThreadPoolExecutor(max_workers=min(len(eap_types), max_workers)) as executor:
+        return list(
+            executor.map(
+                lambda eap_type: execute_eapol_test(config, eap_type, conf_files), eap_types
+            )
+        )
+
+
+def positive_int(value: str) -> int:
+    """
+    Parses a strictly positive integer command-line value.
+
+    Args:
+        value (str): The raw command-line value.
+
+    Returns:
+        int: The parsed value.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not an integer greater than zero.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value!r}")
+    return number
 
 
 def parse_args():
@@ -484,15 +881,38 @@ def parse_args():
         help="Test specific EAP types from the configuration file",
     )
     parser.add_argument("-d", "--debug", action="store_true", help="Enable debug logging")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=positive_int,
+        default=None,
+        help="Maximum number of EAP tests to run concurrently (default: twice the CPU count)",
+    )
     return parser.parse_args()
 
 
+@cache
+def resolve_server(server: str, port: int) -> tuple[tuple[Any, ...], ...]:
+    """
+    Resolves a server address once per process.
+
+    Args:
+        server (str): The server host name or address.
+        port (int): The server port.
+
+    Returns:
+        tuple: The ``socket.getaddrinfo`` entries for a stream connection to the server.
+    """
+    return tuple(socket.getaddrinfo(server, port, type=socket.SOCK_STREAM))
+
+
 def is_radius_server_reachable(server: str, port: int) -> bool:
     """
     Checks if the RADIUS server is reachable.
 
-    This function attempts to establish a connection to the specified RADIUS server and port
-    within a timeout period to determine if the server is reachable.
+    This function resolves the server address (cached across calls) and tries each resolved
+    IPv4 or IPv6 address in turn, returning as soon as one accepts a connection within
+    REACHABILITY_TIMEOUT seconds.
 
     Args:
         server (str): The RADIUS server address.
@@ -502,22 +922,74 @@ def is_radius_server_reachable(server: str, port: int) -> bool:
         bool: True if the server is reachable, False otherwise.
     """
     try:
-        with socket.create_connection((server, port), timeout=5):
-            return True
-    except OSError, TimeoutError:
+        addresses = resolve_server(server, port)
+    except OSError:
         return False
 
+    for family, sock_type, proto, _canonname, sockaddr in addresses:
+        try:
+            with socket.socket(family, sock_type, proto) as sock:
+                sock.settimeout(REACHABILITY_TIMEOUT)
+                if sock.connect_ex(sockaddr) == 0:
+                    return True
+        except OSError, TimeoutError:
+            continue
+    return False
+
+
+def fast_rmtree(root: Path, workers: int = RMTREE_WORKERS) -> None:
+    """
+    Removes a directory tree, unlinking its files from a thread pool.
+
+    The tree is walked once with os.scandir to collect files and directories. Files (including
+    symlinks, which are never followed) are then unlinked concurrently, and the directories are
+    removed deepest first.
+
+    Args:
+        root (Path): The directory to remove.
+        workers (int): Number of threads used for the unlink phase.
+    """
+    files: list[str] = []
+    directories: list[str] = []
+    stack = [os.fspath(root)]
+    while stack:
+        directory = stack.pop()
+        directories.append(directory)
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    files.append(entry.path)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(os.unlink, files))
+
+    # Every directory is recorded before its subdirectories, so reversing removes children first
+    for directory in reversed(directories):
+        os.rmdir(directory)
+
 
 def cleanup() -> None:
     """
     Cleans up temporary files and directories.
 
-    This function removes the temporary hostap directory if it exists and logs the action.
+    This function removes the temporary hostap directory if it exists and logs the action. It
+    then stops the logging listener started by setup_logging(), flushing any queued records, and
+    removes its queue handler from the root logger.
     """
     if HOSTAP_SOURCE_DIR.exists():
-        shutil.rmtree(HOSTAP_SOURCE_DIR)
+        fast_rmtree(HOSTAP_SOURCE_DIR)
         logging.info("Temporary hostap directory removed.")
 
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, QueueHandler) and handler.listener is not None:
+            handler.listener.stop()
+            # Detach the handler too, or a later setup_logging() leaves it filling a dead queue
+            root.removeHandler(handler)
+            handler.close()
+
 
 def main():
     """
@@ -531,12 +1003,14 @@ def main():
     5. Checks if the RADIUS server is reachable before proceeding.
     6. Enables debug-level logging if the debug flag is specified.
     7. Executes EAP tests for specified EAP types or all configured EAP types if none are specified.
+    8. Summarizes the results and exits non-zero if any test failed.
 
     Command-line arguments:
     -e, --eap    : List of specific EAP types to test. If not provided, tests all configured EAP types.
     -d, --debug  : Enable debug-level logging for more detailed output.
+    -j, --jobs   : Maximum number of EAP tests to run concurrently.
 
-    Exits with a non-zero status code if an error occurs during execution.
+    Exits with a non-zero status code if an error occurs during execution or a test fails.
     """
     # Parse command-line arguments
     args = parse_args()
@@ -562,17 +1036,18 @@ def main():
             logging.getLogger().setLevel(logging.DEBUG)
 
         # Execute EAP tests for specified EAP types or all configured EAP types if none are specified
-        if args.eap:
-            for eap_type in args.eap:
-                if eap_type in config.eap_types:
-                    execute_eapol_test(config, eap_type)
-                else:
-                    logging.error("EAP type '%s' is not configured.", eap_type)
-                    sys.exit(1)
-            return
-
-        for eap_type in config.eap_types:
-            execute_eapol_test(config, eap_type)
+        targets = args.eap or list(config.eap_types)
+        for eap_type in targets:
+            if eap_type not in config.eap_types:
+                logging.error("EAP type '%s' is not configured.", eap_type)
+                sys.exit(1)
+
+        results = run_eap_tests(config, targets, jobs=args.jobs)
+        failed = [result.eap_type for result in results if not result.passed]
+        logging.info("%d of %d EAP tests passed.", len(results) - len(failed), len(results))
+        if failed:
+            logging.error("Failed EAP types: %s", ", ".join(failed))
+            sys.exit(1)
     finally:
         cleanup()
 
@@ -8,11 +8,15 @@ Author: Kris Armstrong
 __version__ = "4.1.1"
 """
 
-import json
 import logging
 import os
+from functools import cache
+from typing import TYPE_CHECKING
 
-from jsonschema import ValidationError, validate
+from .utils import json_dumps, json_loads
+
+if TYPE_CHECKING:
+    from jsonschema import Draft7Validator
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +63,8 @@ CONFIG_SCHEMA = {
                 "ttls_mschapv2": {"$ref": "#/definitions/eap_method"},
                 "eap_fast": {"$ref": "#/definitions/eap_method"},
             },
+            # Further methods are run as-is, so hold them to the same shape
+            "additionalProperties": {"$ref": "#/definitions/eap_method"},
         },
     },
     "definitions": {
@@ -71,21 +77,34 @@ CONFIG_SCHEMA = {
 }
 
 
+@cache
+def config_validator() -> Draft7Validator:
+    """Compile CONFIG_SCHEMA on first use; jsonschema is imported lazily to keep startup fast."""
+    from jsonschema import Draft7Validator
+
+    Draft7Validator.check_schema(CONFIG_SCHEMA)
+    return Draft7Validator(CONFIG_SCHEMA)
+
+
 def load_config(config_path: str) -> dict:
     """Load and validate configuration from JSON."""
     if not os.path.exists(config_path):
         logger.error(
-            f"Config file {config_path} not found. Create it using 'eaptestor --generate-config'."
+            "Config file %s not found. Create it using 'eaptestor --generate-config'.", config_path
         )
         raise FileNotFoundError(f"Config file {config_path} not found")
 
-    with open(config_path) as f:
-        config = json.load(f)
+    with open(config_path, "rb") as f:
+        config = json_loads(f.read())
+
+    from jsonschema import ValidationError
 
     try:
-        validate(instance=config, schema=CONFIG_SCHEMA)
+        config_validator().validate(config)
     except ValidationError as e:
-        logger.error(f"Invalid configuration: {e.message}. Check {config_path} against the schema.")
+        logger.error(
+            "Invalid configuration: %s. Check %s against the schema.", e.message, config_path
+        )
         raise ValueError(f"Invalid configuration: {e.message}") from e
 
     # Override sensitive settings with environment variables if present
@@ -144,10 +163,10 @@ def generate_config_template(output_path: str):
         },
     }
     try:
-        with open(output_path, "w") as f:
-            json.dump(template, f, indent=2)
-        logger.info(f"Generated template config at {output_path}")
+        with open(output_path, "wb") as f:
+            f.write(json_dumps(template, indent=True))
+        logger.info("Generated template config at %s", output_path)
         print(f"Template config generated at {output_path}")
     except Exception as e:
-        logger.error(f"Failed to generate config: {e}")
+        logger.error("Failed to generate config: %s", e)
         raise
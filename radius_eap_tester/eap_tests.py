@@ -8,77 +8,180 @@ Author: Kris Armstrong
 __version__ = "4.1.1"
 """
 
-import json
+import asyncio
+import contextlib
+import fcntl
+import hashlib
 import logging
 import os
+import shutil
 import subprocess
+import sys
 import tempfile
+import time
+from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import dataclass, field
+from functools import lru_cache
 
 from tqdm import tqdm
 
+from .utils import json_dumps, json_loads
+
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=256)
+def _file_exists(path: str) -> bool:
+    """Return whether path is a regular file, memoized per process.
+
+    Methods sharing a CA certificate or key stat it once. Rotated certificates are picked up by
+    restarting the process or calling ``_file_exists.cache_clear()``.
+    """
+    return os.path.isfile(path)
+
+
 @dataclass
 class EAPTest:
     name: str
     config: dict
     requires_password: bool
     enabled: bool
+    serialized: bytes = b""  # eapol_test config with the private key password filled in
+    conf_path: str = ""  # Where the serialized config is written for eapol_test
+    command: list[str] = field(default_factory=list)  # Full eapol_test argv, built once
+
+
+def read_results(path: str | None = None) -> list[dict]:
+    """Load the results written by ``run_all_tests(shm=True)``.
+
+    Defaults to the location EAPTestor writes to on this machine.
+    """
+    with open(path or EAPTestor.shm_results_path(), "rb") as f:
+        return json_loads(f.read())
 
 
 class EAPTestor:
     EAPOL_TEST_BIN = "eapol_test"  # Assumes in PATH or specify full path
+    RESULTS_FILE = "test_results.jsonl"  # One JSON object per completed test
+    SHM_RESULTS_FILE = "eaptestor-results.json"  # Compact results array for --shm runs
+    # RAM-backed, with the temp dir as fallback. Results go through mkstemp and os.replace, so a
+    # planted file or symlink is never written through.
+    SHM_DIR = "/dev/shm"  # noqa: S108
+    # Inner methods that authenticate with the server password rather than a client certificate
+    REQUIRES_PASSWORD = frozenset({"peap_mschapv2", "ttls_md5", "ttls_mschapv2", "eap_fast"})
+    TMPDIR_PREFIX = "eaptestor_"  # Marks config directories so orphans can be found later
+    STALE_TMPDIR_AGE = 3600  # Seconds before another run's config directory counts as orphaned
+    LOCK_FILE = ".lock"  # Held with flock by the live instance owning a config directory
 
     def __init__(self, config: dict, dry_run: bool = False):
         self.config = config
         self.dry_run = dry_run
+        # Pick the runner once so the live path never re-checks dry_run
+        self._runner = self._run_test_dry if dry_run else self._run_test_real
         self.tests = self.define_tests()
 
+        # subprocess can only take its posix_spawn fast path for an executable with a directory
+        # component, so resolve the binary against PATH once rather than on every launch
+        self._eapol_test_path = shutil.which(self.EAPOL_TEST_BIN) or self.EAPOL_TEST_BIN
+
+        # Server arguments are the same for every test, so build them once
+        server = self.config["server"]
+        self._server_args = [
+            "-a",
+            server["ipaddress"],
+            "-p",
+            str(server["port"]),
+            "-s",
+            server["secretkey"],
+            "-r",
+            "0",
+            "-M",
+            server["identity"],
+            "-o",
+        ]
+        self._password_args = ["-P", server["password"]]
+        self._path_errors = self.validate_paths()
+        self.remove_stale_tmpdirs()
+        self._tmpdir = tempfile.TemporaryDirectory(prefix=self.TMPDIR_PREFIX)
+        # Held until close() so other instances never sweep this directory, however old it gets
+        self._lock_fd: int | None = os.open(
+            os.path.join(self._tmpdir.name, self.LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o600
+        )
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        self.write_configs()
+        # Every argument, including the conf path, is fixed from here on
+        for test in self.tests:
+            if test.enabled:
+                test.command = self._build_command(test)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Remove the temporary directory holding the eapol_test configs."""
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+        self._tmpdir.cleanup()
+
+    @classmethod
+    def remove_stale_tmpdirs(cls) -> int:
+        """Remove config directories left behind by runs that were killed before close().
+
+        They hold the private key password, so anything owned by this user, older than
+        STALE_TMPDIR_AGE and not locked by a live instance is deleted. Returns the number of
+        directories removed.
+        """
+        cutoff = time.time() - cls.STALE_TMPDIR_AGE
+        uid = os.getuid()
+        stale = []
+        try:
+            # scandir entries carry the directory type, so only candidates need a stat()
+            with os.scandir(tempfile.gettempdir()) as entries:
+                for entry in entries:
+                    if not entry.name.startswith(cls.TMPDIR_PREFIX):
+                        continue
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                    if st.st_uid == uid and st.st_mtime < cutoff and not cls._in_use(entry.path):
+                        stale.append(entry.path)
+        except OSError as e:
+            logger.warning("Could not scan for stale config directories: %s", e)
+            return 0
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                for path in stale:
+                    pool.submit(shutil.rmtree, path, ignore_errors=True)
+            logger.debug("Removed %d stale config directories", len(stale))
+        return len(stale)
+
+    @classmethod
+    def _in_use(cls, path: str) -> bool:
+        """Return whether a live instance still holds the lock on a config directory."""
+        try:
+            fd = os.open(os.path.join(path, cls.LOCK_FILE), os.O_RDWR)
+        except OSError:
+            # No lock file: the owning run died before taking it
+            return False
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        finally:
+            os.close(fd)
+        return False
+
     def define_tests(self) -> list[EAPTest]:
-        """Define EAP tests based on configuration."""
-        eap_methods = self.config.get("eap_methods", {})
+        """Define EAP tests based on configuration, one per method in config order."""
         return [
-            EAPTest("tls", eap_methods["tls"]["config"], False, eap_methods["tls"]["enabled"]),
-            EAPTest(
-                "ttls_tls",
-                eap_methods["ttls_tls"]["config"],
-                False,
-                eap_methods["ttls_tls"]["enabled"],
-            ),
-            EAPTest(
-                "peap_tls",
-                eap_methods["peap_tls"]["config"],
-                False,
-                eap_methods["peap_tls"]["enabled"],
-            ),
-            EAPTest(
-                "peap_mschapv2",
-                eap_methods["peap_mschapv2"]["config"],
-                True,
-                eap_methods["peap_mschapv2"]["enabled"],
-            ),
-            EAPTest(
-                "ttls_md5",
-                eap_methods["ttls_md5"]["config"],
-                True,
-                eap_methods["ttls_md5"]["enabled"],
-            ),
-            EAPTest(
-                "ttls_mschapv2",
-                eap_methods["ttls_mschapv2"]["config"],
-                True,
-                eap_methods["ttls_mschapv2"]["enabled"],
-            ),
-            EAPTest(
-                "eap_fast",
-                eap_methods["eap_fast"]["config"],
-                True,
-                eap_methods["eap_fast"]["enabled"],
-            ),
+            EAPTest(name, method["config"], name in self.REQUIRES_PASSWORD, method["enabled"])
+            for name, method in self.config.get("eap_methods", {}).items()
         ]
 
     def show_config(self):
@@ -92,100 +195,197 @@ class EAPTestor:
         enabled_methods = ", ".join(
             method for method, conf in self.config.get("eap_methods", {}).items() if conf["enabled"]
         )
-        logger.info(f"EAP methods enabled: {enabled_methods}")
+        logger.info("EAP methods enabled: %s", enabled_methods)
         print(f"EAP methods enabled: {enabled_methods}")
 
-    def update_key(self, config_data: dict, config_file: str):
-        """Update private key password in temporary config file."""
-        logger.debug("Updating private key in %s", config_file)
-        try:
-            config_data["private_key_passwd"] = self.config["server"]["private_key_password"]
-            with open(config_file, "w") as f:
-                json.dump(config_data, f, indent=2)
-        except Exception as e:
-            logger.error(f"Failed to update %s: {e}. Ensure write permissions.", config_file)
-            raise
+    def validate_paths(self) -> dict[str, str]:
+        """Check the certificate, key and PAC paths of enabled tests once, keyed by test name."""
+        path_errors: dict[str, str] = {}
+        for test in self.tests:
+            if not test.enabled:
+                continue
+            for key in ["certificate_file", "private_key_file", "ca_cert", "pac_file"]:
+                path = test.config.get(key)
+                if path and not _file_exists(path):
+                    path_errors[test.name] = f"Invalid {key}: {path} does not exist"
+                    break
+        return path_errors
 
-    def run_test(self, test: EAPTest) -> dict:
-        """Run a single EAP test and return result."""
+    def write_configs(self):
+        """Serialize and write each enabled test's config once, for reuse by every run.
+
+        Files are keyed by content, so methods with identical configs share a single file.
+        """
+        private_key_password = self.config["server"]["private_key_password"]
+        self._conf_cache: dict[bytes, str] = {}
+        for test in self.tests:
+            if not test.enabled:
+                continue
+            config_data = {**test.config, "private_key_passwd": private_key_password}
+            test.serialized = json_dumps(config_data, indent=True)
+            key = hashlib.blake2b(test.serialized, digest_size=16).digest()
+            if (conf_path := self._conf_cache.get(key)) is None:
+                conf_path = os.path.join(self._tmpdir.name, f"{key.hex()}.conf")
+                with open(conf_path, "wb") as f:
+                    f.write(test.serialized)
+                self._conf_cache[key] = conf_path
+            test.conf_path = conf_path
+
+    def _skipped(self, test: EAPTest) -> dict | None:
+        """Return a skipped result for a disabled test."""
         if not test.enabled:
-            logger.info(f"Skipping {test.name} (disabled)")
+            logger.info("Skipping %s (disabled)", test.name)
             return {"name": test.name, "status": "skipped", "error": None}
+        return None
 
-        if self.dry_run:
-            logger.info(f"Dry run: Would execute {test.name} test")
-            return {"name": test.name, "status": "dry_run", "error": None}
-
-        # Validate config paths
-        for key in ["certificate_file", "private_key_file", "ca_cert", "pac_file"]:
-            if key in test.config and test.config[key] and not os.path.exists(test.config[key]):
-                logger.error(f"Invalid {key} for {test.name}: {test.config[key]} does not exist")
-                return {
-                    "name": test.name,
-                    "status": "failed",
-                    "error": f"Invalid {key}: {test.config[key]} does not exist",
-                }
-
-        # Create temporary config file
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".conf", delete=False) as temp_conf:
-            temp_conf_path = temp_conf.name
-            json.dump(test.config, temp_conf, indent=2)
-
-        self.update_key(test.config, temp_conf_path)
-
-        logger.info(f"Running {test.name} test")
-        cmd = [
-            self.EAPOL_TEST_BIN,
-            "-c",
-            temp_conf_path,
-            "-a",
-            self.config["server"]["ipaddress"],
-            "-p",
-            str(self.config["server"]["port"]),
-            "-s",
-            self.config["server"]["secretkey"],
-            "-r",
-            "0",
-            "-M",
-            self.config["server"]["identity"],
-            "-o",
-        ]
+    def _precheck(self, test: EAPTest) -> dict | None:
+        """Return a result for tests that must not run (disabled, bad paths)."""
+        if (result := self._skipped(test)) is not None:
+            return result
+
+        # Config paths were validated once at construction
+        if error := self._path_errors.get(test.name):
+            logger.error("%s: %s", test.name, error)
+            return {"name": test.name, "status": "failed", "error": error}
+        return None
+
+    def _build_command(self, test: EAPTest) -> list[str]:
+        """Return the eapol_test command line for a test."""
+        cmd = [self._eapol_test_path, "-c", test.conf_path, *self._server_args]
         if test.requires_password:
-            cmd.extend(["-P", self.config["server"]["password"]])
+            cmd.extend(self._password_args)
+        return cmd
+
+    def _failed(self, test: EAPTest, stderr: str) -> dict:
+        logger.error("%s test failed: %s. Check FreeRADIUS server and config.", test.name, stderr)
+        return {"name": test.name, "status": "failed", "error": stderr}
 
+    def _binary_missing(self, test: EAPTest) -> dict:
+        logger.error(
+            "%s test failed: %s not found. Ensure it is installed.", test.name, self.EAPOL_TEST_BIN
+        )
+        return {
+            "name": test.name,
+            "status": "failed",
+            "error": f"{self.EAPOL_TEST_BIN} not found",
+        }
+
+    def run_test(self, test: EAPTest) -> dict:
+        """Run a single EAP test, or only report it in a dry run, and return result."""
+        return self._runner(test)
+
+    def _run_test_dry(self, test: EAPTest) -> dict:
+        """Report what a single EAP test would do without running it."""
+        if (result := self._skipped(test)) is not None:
+            return result
+        logger.info("Dry run: Would execute %s test", test.name)
+        return {"name": test.name, "status": "dry_run", "error": None}
+
+    def _run_test_real(self, test: EAPTest) -> dict:
+        """Run a single EAP test and return result."""
+        if (result := self._precheck(test)) is not None:
+            return result
+
+        # One INFO record per test, written when it completes
+        logger.debug("Running %s test", test.name)
         try:
-            if not self.dry_run:
-                subprocess.run(cmd, capture_output=True, text=True, check=True)
-                logger.info(f"{test.name} test completed successfully")
-            status = {
-                "name": test.name,
-                "status": "success" if not self.dry_run else "dry_run",
-                "error": None,
-            }
-        except subprocess.CalledProcessError as e:
-            logger.error(
-                f"{test.name} test failed: {e.stderr}. Check FreeRADIUS server and config."
-            )
-            status = {"name": test.name, "status": "failed", "error": e.stderr}
+            # No preexec_fn, cwd or new session, so CPython can launch with posix_spawn
+            with subprocess.Popen(
+                test.command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, close_fds=True
+            ) as proc:
+                _stdout, stderr = proc.communicate()
         except FileNotFoundError:
-            logger.error(
-                f"{test.name} test failed: {self.EAPOL_TEST_BIN} not found. Ensure it is installed."
+            return self._binary_missing(test)
+
+        if proc.returncode != 0:
+            # Output stays as bytes and is only decoded when it is reported
+            return self._failed(test, stderr.decode("utf-8", errors="replace"))
+        logger.info("%s test completed successfully", test.name)
+        return {"name": test.name, "status": "success", "error": None}
+
+    async def _run_test_async(self, test: EAPTest) -> dict:
+        """Run a single EAP test as an asyncio subprocess and return result."""
+        if (result := self._precheck(test)) is not None:
+            return result
+
+        # One INFO record per test, written when it completes
+        logger.debug("Running %s test", test.name)
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *test.command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
             )
-            status = {
-                "name": test.name,
-                "status": "failed",
-                "error": f"{self.EAPOL_TEST_BIN} not found",
-            }
-        finally:
-            try:
-                os.unlink(temp_conf_path)
-            except Exception as e:
-                logger.warning(f"Failed to delete temp file {temp_conf_path}: {e}")
+            _stdout, stderr = await proc.communicate()
+        except FileNotFoundError:
+            return self._binary_missing(test)
+
+        if proc.returncode != 0:
+            return self._failed(test, stderr.decode("utf-8", errors="replace"))
+        logger.info("%s test completed successfully", test.name)
+        return {"name": test.name, "status": "success", "error": None}
+
+    async def _run_all_async(
+        self, tests: list[EAPTest], record: Callable[[dict], dict]
+    ) -> list[dict]:
+        """Run tests concurrently, at most one per CPU at a time to spare the RADIUS server.
+
+        All pipes and child exits are multiplexed on the one event loop (epoll and pidfds on
+        Linux), so completions for every in-flight test arrive through a single wait. Each
+        result is passed to ``record`` as soon as its test finishes.
+        """
+        semaphore = asyncio.Semaphore(min(len(tests), os.cpu_count() or 4))
 
-        return status
+        async def bounded(test: EAPTest) -> dict:
+            async with semaphore:
+                return record(await self._run_test_async(test))
 
-    def run_all_tests(self, parallel: bool = False):
-        """Run all enabled EAP tests, optionally in parallel."""
+        return list(await asyncio.gather(*(bounded(test) for test in tests)))
+
+    @staticmethod
+    def _open_results():
+        try:
+            return open(EAPTestor.RESULTS_FILE, "wb")
+        except OSError as e:
+            logger.warning("Failed to export results: %s", e)
+            return None
+
+    @classmethod
+    def shm_results_path(cls) -> str:
+        """Return where shm-mode results are written."""
+        directory = cls.SHM_DIR if os.path.isdir(cls.SHM_DIR) else tempfile.gettempdir()
+        return os.path.join(directory, cls.SHM_RESULTS_FILE)
+
+    def _export_shm(self, results: list[dict]) -> str | None:
+        """Write results as one compact JSON array, replacing the previous file atomically."""
+        path = self.shm_results_path()
+        try:
+            data = json_dumps(results)
+        except (TypeError, ValueError) as e:
+            logger.warning("Failed to export results: %s", e)
+            return None
+
+        tmp_path = None
+        try:
+            # mkstemp creates the file readable by this user only; errors can echo secrets
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=self.TMPDIR_PREFIX)
+            with open(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Failed to export results: %s", e)
+            # Never leave a partial copy of the results behind
+            if tmp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+            return None
+        return path
+
+    def run_all_tests(self, parallel: bool = False, shm: bool = False):
+        """Run all enabled EAP tests, optionally in parallel.
+
+        Each result is appended to RESULTS_FILE as one JSON line as soon as its test finishes,
+        so the file holds every completed result even if the run is interrupted. With ``shm``,
+        the whole result list is instead written once to shm_results_path() for read_results().
+        """
         self.show_config()
         results = []
 
@@ -197,24 +397,55 @@ class EAPTestor:
             print("Warning: No EAP methods enabled.")
             return results
 
-        if parallel:
-            logger.info("Running tests in parallel")
-            with ThreadPoolExecutor() as executor:
-                results = list(executor.map(self.run_test, enabled_tests))
-        else:
-            logger.info("Running tests sequentially")
-            for test in tqdm(enabled_tests, desc="Testing EAP methods", unit="test"):
-                results.append(self.run_test(test))
+        results_fp = None if shm else self._open_results()
+
+        def record(result: dict) -> dict:
+            nonlocal results_fp
+            if results_fp is not None:
+                line = {**result, "timestamp_ns": time.time_ns()}
+                try:
+                    results_fp.write(json_dumps(line) + b"\n")
+                    results_fp.flush()
+                except OSError as e:
+                    # A failed export is only a warning; stop writing and let the tests finish
+                    logger.warning("Failed to export results: %s", e)
+                    with contextlib.suppress(OSError):
+                        results_fp.close()
+                    results_fp = None
+            return result
 
-        # Export results
-        results_json = {"tests": results, "timestamp": str(datetime.now())}
         try:
-            with open("test_results.json", "w") as f:
-                json.dump(results_json, f, indent=2)
-            logger.info("Test results exported to test_results.json")
-            print("Test results exported to test_results.json")
-        except Exception as e:
-            logger.warning(f"Failed to export results: {e}")
+            if self.dry_run:
+                # Nothing is spawned, so there is no point starting an event loop
+                results = [record(self.run_test(test)) for test in enabled_tests]
+            elif parallel:
+                logger.info("Running tests in parallel")
+                results = asyncio.run(self._run_all_async(enabled_tests, record))
+            else:
+                logger.info("Running tests sequentially")
+                # Redirected stderr (CI logs) gets no progress bar instead of one render per test
+                interactive = sys.stderr.isatty()
+                progress = tqdm(
+                    enabled_tests,
+                    desc="Testing EAP methods",
+                    unit="test",
+                    disable=not interactive,
+                    leave=interactive,
+                    mininterval=0.5,
+                )
+                for test in progress:
+                    results.append(record(self.run_test(test)))
+        finally:
+            if results_fp is not None:
+                results_fp.close()
+
+        if shm:
+            exported = self._export_shm(results)
+        else:
+            exported = self.RESULTS_FILE if results_fp is not None else None
+        if exported is not None:
+            logger.info("Test results exported to %s", exported)
+            print(f"Test results exported to {exported}")
 
         logger.info("Test Summary:")
         print("\nTest Summary:")
@@ -28,24 +28,33 @@ def main():
     parser.add_argument(
         "--generate-config", action="store_true", help="Generate a template config file"
     )
+    parser.add_argument(
+        "--shm",
+        action="store_true",
+        help="Write compact JSON results to /dev/shm instead of test_results.jsonl",
+    )
     parser.add_argument("--verbose", action="store_true", help="Enable debug logging")
     args = parser.parse_args()
 
-    setup_logging(verbose=args.verbose)
+    listener = setup_logging(verbose=args.verbose)
     logger = logging.getLogger(__name__)
 
-    if args.generate_config:
-        generate_config_template(args.config)
-        return
-
     try:
-        config = load_config(args.config)
-        eaptestor = EAPTestor(config, dry_run=args.dry_run)
-        eaptestor.run_all_tests(parallel=args.parallel)
-    except Exception as e:
-        logger.error(f"EAPTestor execution failed: {e}")
-        print(f"Error: {e}")
-        exit(1)
+        if args.generate_config:
+            generate_config_template(args.config)
+            return
+
+        try:
+            config = load_config(args.config)
+            with EAPTestor(config, dry_run=args.dry_run) as eaptestor:
+                eaptestor.run_all_tests(parallel=args.parallel, shm=args.shm)
+        except Exception as e:
+            logger.error("EAPTestor execution failed: %s", e)
+            print(f"Error: {e}")
+            exit(1)
+    finally:
+        # Flush queued records before the process exits
+        listener.stop()
 
 
 if __name__ == "__main__":
@@ -9,19 +9,55 @@ __version__ = "4.1.1"
 """
 
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
 
+try:
+    from orjson import OPT_INDENT_2
+    from orjson import dumps as _orjson_dumps
+    from orjson import loads as json_loads
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib encoder
+    import json
+    from json import loads as json_loads
 
-def setup_logging(log_file: str = "eaptestor.log", verbose: bool = False):
-    """Configure logging to file and console."""
+    def json_dumps(obj: Any, indent: bool = False) -> bytes:
+        """Serialize obj to UTF-8 JSON bytes, indented by two spaces if requested."""
+        return json.dumps(obj, indent=2 if indent else None).encode()
+
+else:
+
+    def json_dumps(obj: Any, indent: bool = False) -> bytes:
+        """Serialize obj to UTF-8 JSON bytes, indented by two spaces if requested."""
+        return _orjson_dumps(obj, option=OPT_INDENT_2 if indent else None)
+
+
+__all__ = ["json_dumps", "json_loads", "setup_logging"]
+
+
+def setup_logging(log_file: str = "eaptestor.log", verbose: bool = False) -> QueueListener:
+    """Configure logging to file and console.
+
+    File records are queued to a listener thread, so tests emitting log lines never wait on disk
+    I/O. The console handler stays on the calling thread so its lines keep their order relative
+    to print() output. The caller stops the returned listener to flush the queue.
+    """
     logger = logging.getLogger()
     logger.setLevel(logging.DEBUG if verbose else logging.INFO)
 
+    formatter = logging.Formatter("%(asctime)s: %(message)s")
+
     # File handler
     file_handler = logging.FileHandler(log_file)
-    file_handler.setFormatter(logging.Formatter("%(asctime)s: %(message)s"))
-    logger.addHandler(file_handler)
+    file_handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = QueueListener(log_queue, file_handler)
+    logger.addHandler(QueueHandler(log_queue))
+    listener.start()
 
     # Console handler
     console_handler = logging.StreamHandler()
-    console_handler.setFormatter(logging.Formatter("%(asctime)s: %(message)s"))
+    console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
+    return listener
@@ -27,6 +27,24 @@ class TestConfig(unittest.TestCase):
         with self.assertRaises(FileNotFoundError):
             load_config("nonexistent.json")
 
+    def test_invalid_config(self):
+        with open(self.config_file) as f:
+            config = json.load(f)
+        del config["server"]["port"]
+        with open(self.config_file, "w") as f:
+            json.dump(config, f)
+        with self.assertRaises(ValueError):
+            load_config(self.config_file)
+
+    def test_extra_method_must_match_shape(self):
+        with open(self.config_file) as f:
+            config = json.load(f)
+        config["eap_methods"]["pwd"] = {"enabled": True}
+        with open(self.config_file, "w") as f:
+            json.dump(config, f)
+        with self.assertRaises(ValueError):
+            load_config(self.config_file)
+
     def test_generate_config(self):
         generate_config_template(self.temp_config)
         self.assertTrue(os.path.exists(self.temp_config))
@@ -0,0 +1,250 @@
+import json
+import os
+import stat
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from radius_eap_tester.eap_tests import EAPTestor, read_results
+
+METHODS = ["tls", "ttls_tls", "peap_tls", "peap_mschapv2", "ttls_md5", "ttls_mschapv2", "eap_fast"]
+
+
+def make_config(enabled=("peap_mschapv2", "ttls_md5")):
+    return {
+        "server": {
+            "ipaddress": "127.0.0.1",
+            "port": 1812,
+            "secretkey": "secret",
+            "private_key_password": "keypass",
+            "identity": "testuser",
+            "password": "testpass",
+        },
+        "eap_methods": {
+            name: {"enabled": name in enabled, "config": {"method": name}} for name in METHODS
+        },
+    }
+
+
+class TestEAPTestor(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.temp_dir.cleanup()
+
+    def fake_eapol_test(self, script):
+        self.eapol_test_bin = os.path.join(self.temp_dir.name, "eapol_test")
+        with open(self.eapol_test_bin, "w") as f:
+            f.write(f"#!/bin/sh\n{script}\n")
+        os.chmod(self.eapol_test_bin, os.stat(self.eapol_test_bin).st_mode | stat.S_IXUSR)
+        return self.eapol_test_bin
+
+    def make_testor(self, script, eapol_test_bin=None, **kwargs):
+        eapol_test_bin = eapol_test_bin or self.fake_eapol_test(script)
+        with mock.patch.object(EAPTestor, "EAPOL_TEST_BIN", eapol_test_bin):
+            testor = EAPTestor(make_config(**kwargs))
+        self.addCleanup(testor.close)
+        return testor
+
+    def test_run_test_success(self):
+        testor = self.make_testor("exit 0")
+        result = testor.run_test(testor.tests[3])
+        self.assertEqual(result, {"name": "peap_mschapv2", "status": "success", "error": None})
+
+    def test_define_tests_follows_config(self):
+        config = make_config()
+        config["eap_methods"]["pwd"] = {"enabled": False, "config": {"method": "pwd"}}
+        with EAPTestor(config) as testor:
+            self.assertEqual([t.name for t in testor.tests], [*METHODS, "pwd"])
+            self.assertEqual(
+                {t.name for t in testor.tests if t.requires_password},
+                EAPTestor.REQUIRES_PASSWORD,
+            )
+
+    def test_command_line(self):
+        testor = self.make_testor("exit 0")
+        tls, peap = testor.tests[0], testor.tests[3]
+        common = ["-a", "127.0.0.1", "-p", "1812", "-s", "secret", "-r", "0", "-M", "testuser"]
+        self.assertEqual(
+            peap.command,
+            [self.eapol_test_bin, "-c", peap.conf_path, *common, "-o", "-P", "testpass"],
+        )
+        self.assertNotIn("-P", testor._build_command(tls))
+        self.assertEqual(tls.command, [])
+
+    def test_binary_resolved_from_path(self):
+        self.fake_eapol_test("exit 0")
+        with mock.patch.dict(os.environ, {"PATH": self.temp_dir.name}):
+            testor = EAPTestor(make_config())
+        self.addCleanup(testor.close)
+        self.assertEqual(testor.tests[3].command[0], self.eapol_test_bin)
+        self.assertEqual(testor.run_test(testor.tests[3])["status"], "success")
+
+    def test_run_test_failure_reports_stderr(self):
+        testor = self.make_testor("echo rejected >&2; exit 1")
+        result = testor.run_test(testor.tests[3])
+        self.assertEqual(result["status"], "failed")
+        self.assertEqual(result["error"], "rejected\n")
+
+    def test_run_test_skips_disabled(self):
+        testor = self.make_testor("exit 0")
+        self.assertEqual(testor.run_test(testor.tests[0])["status"], "skipped")
+
+    def test_parallel_reports_failures_in_order(self):
+        testor = self.make_testor("echo rejected >&2; exit 1")
+        results = testor.run_all_tests(parallel=True)
+        self.assertEqual([r["name"] for r in results], ["peap_mschapv2", "ttls_md5"])
+        self.assertEqual([r["status"] for r in results], ["failed", "failed"])
+        self.assertIn("rejected", results[0]["error"])
+
+    def test_sequential_results_streamed_per_test(self):
+        testor = self.make_testor("exit 0")
+        results = testor.run_all_tests()
+        with open(EAPTestor.RESULTS_FILE) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([line["name"] for line in lines], [r["name"] for r in results])
+        self.assertTrue(all(line["status"] == "success" for line in lines))
+
+    def test_export_failure_does_not_stop_tests(self):
+        testor = self.make_testor("exit 0")
+        results_fp = mock.Mock()
+        results_fp.write.side_effect = OSError(28, "No space left on device")
+        with mock.patch.object(EAPTestor, "_open_results", return_value=results_fp):
+            with self.assertLogs("radius_eap_tester.eap_tests", "WARNING") as logs:
+                results = testor.run_all_tests(parallel=True)
+        self.assertEqual([r["status"] for r in results], ["success", "success"])
+        self.assertEqual(results_fp.write.call_count, 1)
+        results_fp.close.assert_called_once()
+        self.assertEqual(len(logs.output), 1)
+
+    def test_no_progress_bar_without_tty(self):
+        testor = self.make_testor("exit 0")
+        with mock.patch("sys.stderr") as stderr:
+            stderr.isatty.return_value = False
+            testor.run_all_tests()
+        stderr.write.assert_not_called()
+
+    def test_shm_results_round_trip(self):
+        testor = self.make_testor("exit 0")
+        with mock.patch.object(EAPTestor, "SHM_DIR", self.temp_dir.name):
+            results = testor.run_all_tests(parallel=True, shm=True)
+            path = EAPTestor.shm_results_path()
+            self.assertEqual(read_results(), results)
+        self.assertEqual(os.path.dirname(path), self.temp_dir.name)
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+        self.assertFalse(os.path.exists(EAPTestor.RESULTS_FILE))
+
+    def test_shm_export_failure_removes_temp_file(self):
+        testor = self.make_testor("exit 0")
+        with (
+            mock.patch.object(EAPTestor, "SHM_DIR", self.temp_dir.name),
+            mock.patch("os.replace", side_effect=PermissionError(1, "Operation not permitted")),
+            self.assertLogs("radius_eap_tester.eap_tests", "WARNING"),
+        ):
+            testor.run_all_tests(shm=True)
+        leftovers = [n for n in os.listdir(self.temp_dir.name) if n != "eapol_test"]
+        self.assertEqual(leftovers, [])
+
+    def test_parallel_missing_binary(self):
+        missing = os.path.join(self.temp_dir.name, "missing", "eapol_test")
+        testor = self.make_testor("exit 0", eapol_test_bin=missing)
+        results = testor.run_all_tests(parallel=True)
+        self.assertTrue(all(r["status"] == "failed" for r in results))
+        self.assertIn("not found", results[0]["error"])
+
+    def test_configs_written_once_with_key_password(self):
+        with EAPTestor(make_config()) as testor:
+            test = testor.tests[3]
+            with open(test.conf_path, "rb") as f:
+                self.assertEqual(f.read(), test.serialized)
+            self.assertEqual(
+                json.loads(test.serialized),
+                {"method": "peap_mschapv2", "private_key_passwd": "keypass"},
+            )
+            self.assertNotIn("private_key_passwd", test.config)
+            self.assertEqual(testor.tests[0].conf_path, "")
+        self.assertFalse(os.path.exists(test.conf_path))
+
+    def test_identical_configs_share_one_file(self):
+        config = make_config(enabled=("tls", "peap_tls", "ttls_md5"))
+        config["eap_methods"]["peap_tls"]["config"] = {"method": "tls"}
+        with EAPTestor(config) as testor:
+            tls, peap_tls, ttls_md5 = testor.tests[0], testor.tests[2], testor.tests[4]
+            self.assertEqual(tls.conf_path, peap_tls.conf_path)
+            self.assertNotEqual(tls.conf_path, ttls_md5.conf_path)
+            conf_files = os.listdir(os.path.dirname(tls.conf_path))
+            self.assertEqual(len([n for n in conf_files if n.endswith(".conf")]), 2)
+
+    def test_missing_certificate_fails_without_running(self):
+        config = make_config(enabled=("tls",))
+        config["eap_methods"]["tls"]["config"]["ca_cert"] = "/nonexistent/ca.pem"
+        testor = EAPTestor(config)
+        self.addCleanup(testor.close)
+        result = testor.run_test(testor.tests[0])
+        self.assertEqual(result["status"], "failed")
+        self.assertEqual(result["error"], "Invalid ca_cert: /nonexistent/ca.pem does not exist")
+
+    def test_stale_tmpdirs_removed(self):
+        with mock.patch.object(tempfile, "tempdir", self.temp_dir.name):
+            stale = tempfile.mkdtemp(prefix=EAPTestor.TMPDIR_PREFIX)
+            fresh = tempfile.mkdtemp(prefix=EAPTestor.TMPDIR_PREFIX)
+            other = tempfile.mkdtemp(prefix="other_")
+            old = os.stat(stale).st_mtime - 2 * EAPTestor.STALE_TMPDIR_AGE
+            os.utime(stale, (old, old))
+            os.utime(other, (old, old))
+            testor = EAPTestor(make_config())
+            self.addCleanup(testor.close)
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.isdir(fresh))
+        self.assertTrue(os.path.isdir(other))
+
+    def test_live_tmpdir_survives_sweep(self):
+        with mock.patch.object(tempfile, "tempdir", self.temp_dir.name):
+            live = EAPTestor(make_config())
+            self.addCleanup(live.close)
+            old = time.time() - 2 * EAPTestor.STALE_TMPDIR_AGE
+            os.utime(live._tmpdir.name, (old, old))
+            self.assertEqual(EAPTestor.remove_stale_tmpdirs(), 0)
+            self.assertTrue(os.path.isdir(live._tmpdir.name))
+
+            # Releasing the lock is what a killed process leaves behind
+            os.close(live._lock_fd)
+            live._lock_fd = None
+            self.assertEqual(EAPTestor.remove_stale_tmpdirs(), 1)
+
+    def test_dry_run_never_spawns(self):
+        testor = EAPTestor(make_config(), dry_run=True)
+        self.addCleanup(testor.close)
+        with mock.patch("subprocess.Popen") as popen:
+            self.assertEqual(testor.run_test(testor.tests[3])["status"], "dry_run")
+            self.assertEqual(testor.run_test(testor.tests[0])["status"], "skipped")
+        popen.assert_not_called()
+
+    def test_run_test_can_be_patched_on_the_class(self):
+        testor = self.make_testor("exit 1")
+        canned = {"name": "stub", "status": "success", "error": None}
+        with mock.patch.object(EAPTestor, "run_test", return_value=canned) as run_test:
+            results = testor.run_all_tests()
+        self.assertEqual(results, [canned, canned])
+        self.assertEqual(run_test.call_count, 2)
+
+    def test_dry_run(self):
+        testor = EAPTestor(make_config(), dry_run=True)
+        self.addCleanup(testor.close)
+        results = testor.run_all_tests(parallel=True)
+        self.assertEqual([r["status"] for r in results], ["dry_run", "dry_run"])
+        with open(EAPTestor.RESULTS_FILE) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), len(results))
+        for line in lines:
+            self.assertIsInstance(line.pop("timestamp_ns"), int)
+            self.assertIn(line, results)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import io
+import logging
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from radius_eap_tester.utils import setup_logging
+
+
+class TestSetupLogging(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = logging.getLogger()
+        self.handlers, self.level = list(root.handlers), root.level
+
+    def tearDown(self):
+        root = logging.getLogger()
+        for handler in root.handlers:
+            if handler not in self.handlers:
+                handler.close()
+        root.handlers[:] = self.handlers
+        root.setLevel(self.level)
+        self.temp_dir.cleanup()
+
+    def test_console_output_stays_ordered_with_print(self):
+        log_file = os.path.join(self.temp_dir.name, "eaptestor.log")
+        output = io.StringIO()
+        with redirect_stdout(output), redirect_stderr(output):
+            listener = setup_logging(log_file)
+            try:
+                for index in range(50):
+                    logging.info("logged %d", index)
+                    print(f"printed {index}")
+            finally:
+                listener.stop()
+        lines = [line.split(": ", 1)[-1] for line in output.getvalue().splitlines()]
+        expected = [f"{kind} {index}" for index in range(50) for kind in ("logged", "printed")]
+        self.assertEqual(lines, expected)
+        with open(log_file) as f:
+            self.assertEqual(len(f.read().splitlines()), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -50,6 +50,9 @@ def test_load_config_success(config_workspace: Path) -> None:
     assert "eap_md5" in config.eap_types
     assert config.eap_types["eap_md5"].settings["password"] == "wonderland"
     assert config.eap_types["eap_md5"].conf_path == config_workspace / "eap_md5.conf"
+    assert not hasattr(config.eap_types["eap_md5"], "__dict__")
+    with pytest.raises(TypeError):
+        config.eap_types["eap_md5"].settings["password"] = "changed"
 
 
 def test_load_config_invalid_triggers_exit(config_workspace: Path) -> None:
@@ -69,31 +72,327 @@ def test_execute_eapol_test_requires_conf_file(
 
     config = eap_auth_test.load_config()
 
-    eap_auth_test.execute_eapol_test(config, "eap_md5")
+    result = eap_auth_test.execute_eapol_test(config, "eap_md5")
 
     assert "Configuration file" in caplog.text
+    assert result.passed is False
+
+
+def fake_eapol_test(tmp_path: Path, script: str) -> Path:
+    executable = tmp_path / "eapol_test"
+    executable.write_text(f"#!/bin/sh\n{script}\n", encoding="utf-8")
+    executable.chmod(0o755)
+    return executable
 
 
 def test_execute_eapol_test_runs_when_conf_present(
-    config_workspace: Path, caplog: pytest.LogCaptureFixture, monkeypatch: pytest.MonkeyPatch
+    config_workspace: Path,
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    caplog.set_level("INFO")
+    caplog.set_level("DEBUG")
     write_config(config_workspace, minimal_config())
     (config_workspace / "eap_md5.conf").write_text("network=0", encoding="utf-8")
+    monkeypatch.setattr(eap_auth_test, "EAPOL_TEST_PATH", fake_eapol_test(tmp_path, 'echo "ok $1"'))
 
     config = eap_auth_test.load_config()
 
-    calls = {}
+    result = eap_auth_test.execute_eapol_test(config, "eap_md5")
+
+    assert any("test passed" in message.message for message in caplog.records)
+    assert "eap_md5: ok -a127.0.0.1" in caplog.messages
+    assert result == eap_auth_test.EAPTestResult("eap_md5", passed=True, returncode=0)
+
+
+def test_execute_eapol_test_streams_stderr_on_failure(
+    config_workspace: Path,
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    caplog.set_level("ERROR")
+    write_config(config_workspace, minimal_config())
+    (config_workspace / "eap_md5.conf").write_text("network=0", encoding="utf-8")
+    monkeypatch.setattr(
+        eap_auth_test, "EAPOL_TEST_PATH", fake_eapol_test(tmp_path, "echo rejected >&2; exit 3")
+    )
+
+    config = eap_auth_test.load_config()
+
+    result = eap_auth_test.execute_eapol_test(config, "eap_md5")
+
+    assert "eap_md5: rejected" in caplog.messages
+    assert result == eap_auth_test.EAPTestResult("eap_md5", passed=False, returncode=3)
+
+
+def test_execute_eapol_test_keeps_stderr_below_error_on_success(
+    config_workspace: Path,
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    caplog.set_level("DEBUG")
+    write_config(config_workspace, minimal_config())
+    (config_workspace / "eap_md5.conf").write_text("network=0", encoding="utf-8")
+    monkeypatch.setattr(
+        eap_auth_test, "EAPOL_TEST_PATH", fake_eapol_test(tmp_path, "echo diagnostic >&2")
+    )
+
+    config = eap_auth_test.load_config()
+
+    result = eap_auth_test.execute_eapol_test(config, "eap_md5")
+
+    assert result.passed is True
+    assert "eap_md5: diagnostic" in caplog.messages
+    assert not [record for record in caplog.records if record.levelname == "ERROR"]
+
+
+def test_run_eap_tests_preserves_order_and_reports_failures(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def fake_execute(config, eap_type, conf_files=None):
+        return eap_auth_test.EAPTestResult(eap_type, passed=eap_type != "eap_tls")
+
+    monkeypatch.setattr(eap_auth_test, "execute_eapol_test", fake_execute)
+
+    results = eap_auth_test.run_eap_tests(
+        SimpleNamespace(eap_types={}), ["eap_md5", "eap_tls", "eap_peap"], jobs=2
+    )
+
+    assert [result.eap_type for result in results] == ["eap_md5", "eap_tls", "eap_peap"]
+    assert [result.passed for result in results] == [True, False, True]
+
+
+@pytest.mark.parametrize("value", ["0", "-1", "many"])
+def test_positive_int_rejects_invalid_values(value: str) -> None:
+    with pytest.raises(eap_auth_test.argparse.ArgumentTypeError):
+        eap_auth_test.positive_int(value)
+
+
+def test_cleanup_detaches_queue_handler(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(eap_auth_test, "HOSTAP_SOURCE_DIR", tmp_path / "hostap")
+    root = eap_auth_test.logging.getLogger()
+    original_handlers = list(root.handlers)
+    try:
+        for _ in range(2):
+            eap_auth_test.setup_logging(tmp_path / "logs" / "eap_test.log")
+            eap_auth_test.cleanup()
+        assert root.handlers == original_handlers
+    finally:
+        root.handlers[:] = original_handlers
+
+
+@pytest.mark.parametrize("filler", ["record", "\ufffd" * 6])
+def test_size_tracking_handler_rolls_over(tmp_path: Path, filler: str) -> None:
+    log_file = tmp_path / "eap_test.log"
+    handler = eap_auth_test.SizeTrackingRotatingFileHandler(
+        log_file, maxBytes=64, backupCount=2, encoding="utf-8"
+    )
+    handler.setFormatter(eap_auth_test.logging.Formatter("%(message)s"))
+    try:
+        for index in range(20):
+            record = eap_auth_test.logging.LogRecord(
+                "test", eap_auth_test.logging.INFO, __file__, 0, f"{filler} {index:02d}", None, None
+            )
+            handler.handle(record)
+    finally:
+        handler.close()
+
+    assert (tmp_path / "eap_test.log.1").exists()
+    for path in (log_file, tmp_path / "eap_test.log.1", tmp_path / "eap_test.log.2"):
+        assert path.stat().st_size < 64
+
+
+def test_patch_build_config_rewrites_and_appends(tmp_path: Path) -> None:
+    config_path = tmp_path / ".config"
+    config_path.write_text(
+        "CONFIG_LIBNL32=y\n"
+        "#CFLAGS += -I/usr/local/openssl/include\n"
+        "#LIBS += -L/usr/local/openssl/lib\n"
+        "CONFIG_TLS=openssl\n"
+    )
+
+    text = eap_auth_test.patch_build_config(config_path)
+
+    lines = config_path.read_text().splitlines()
+    assert text == config_path.read_text()
+    assert lines[:3] == [
+        "# CONFIG_LIBNL32=y",
+        "CFLAGS += -I/opt/homebrew/opt/openssl/include/openssl",
+        "LIBS += -L/opt/homebrew/opt/openssl/lib -lssl -lcrypto",
+    ]
+    assert lines.count("CONFIG_TLS=openssl") == 1
+    assert "CONFIG_EAPOL_TEST=y" in lines
+
+
+def test_is_radius_server_reachable_detects_listener() -> None:
+    with eap_auth_test.socket.create_server(("127.0.0.1", 0)) as server:
+        port = server.getsockname()[1]
+        assert eap_auth_test.is_radius_server_reachable("127.0.0.1", port)
+
+    assert not eap_auth_test.is_radius_server_reachable("127.0.0.1", port)
+
+
+def test_fast_rmtree_removes_tree_without_following_symlinks(tmp_path: Path) -> None:
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "keep.txt").write_text("keep")
+    root = tmp_path / "hostap"
+    nested = root / "src" / "pae"
+    nested.mkdir(parents=True)
+    (root / "README").write_text("hostap")
+    (nested / "ieee802_1x_kay.c").write_text("int main;")
+    (root / "src" / "link").symlink_to(outside, target_is_directory=True)
+
+    eap_auth_test.fast_rmtree(root, workers=2)
+
+    assert not root.exists()
+    assert (outside / "keep.txt").exists()
+
+
+def test_load_config_reuses_result_until_file_changes(config_workspace: Path) -> None:
+    config_file = write_config(config_workspace, minimal_config())
+
+    first = eap_auth_test.load_config()
+    assert eap_auth_test.load_config() is first
+
+    updated = minimal_config()
+    updated["radius"]["port"] = 1645
+    write_config(config_workspace, updated)
+    stat = config_file.stat()
+    eap_auth_test.os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert eap_auth_test.load_config().radius.port == 1645
+
+
+def test_load_config_notices_edit_with_unchanged_mtime(config_workspace: Path) -> None:
+    config_file = write_config(config_workspace, minimal_config())
+    stat = config_file.stat()
+    assert eap_auth_test.load_config().radius.port == 1812
+
+    updated = minimal_config()
+    updated["radius"]["port"] = 18120
+    write_config(config_workspace, updated)
+    eap_auth_test.os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert eap_auth_test.load_config().radius.port == 18120
+
+
+def test_load_config_shared_eap_types_are_read_only(config_workspace: Path) -> None:
+    write_config(config_workspace, minimal_config())
+
+    config = eap_auth_test.load_config()
+
+    with pytest.raises(TypeError):
+        del config.eap_types["eap_md5"]
+    assert "eap_md5" in eap_auth_test.load_config().eap_types
+
+
+def test_scan_conf_files_lists_only_conf_files(config_workspace: Path) -> None:
+    (config_workspace / "eap_md5.conf").write_text("network=0", encoding="utf-8")
+    (config_workspace / "notes.txt").write_text("", encoding="utf-8")
+    (config_workspace / "stale.conf").mkdir()
+
+    found = eap_auth_test.scan_conf_files([config_workspace, config_workspace / "missing"])
+
+    assert found == {config_workspace / "eap_md5.conf"}
+
+
+def test_find_missing_packages_uses_one_query(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
 
     def fake_run(command, **kwargs):
+        calls.append(command)
+        return SimpleNamespace(
+            returncode=1,
+            stdout="libnl-3-dev installed\nlibnl-genl-3-dev not-installed\n",
+            stderr="",
+        )
+
+    monkeypatch.setattr(eap_auth_test.subprocess, "run", fake_run)
+
+    missing = eap_auth_test.find_missing_packages("apt", ["libnl-3-dev", "libnl-genl-3-dev"])
+
+    assert missing == ["libnl-genl-3-dev"]
+    assert len(calls) == 1
+    assert calls[0][0] == "dpkg-query"
+
+
+def test_execute_eapol_test_keeps_posix_spawn_eligible_launch(
+    config_workspace: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    write_config(config_workspace, minimal_config())
+    (config_workspace / "eap_md5.conf").write_text("network=0", encoding="utf-8")
+    config = eap_auth_test.load_config()
+    calls = {}
+
+    def fake_popen(command, **kwargs):
         calls["command"] = command
-        assert kwargs.get("capture_output") is True
-        assert kwargs.get("text") is True
-        return SimpleNamespace(returncode=0, stdout="ok", stderr="")
+        calls["kwargs"] = kwargs
+        raise OSError("not launched")
+
+    monkeypatch.setattr(eap_auth_test.subprocess, "Popen", fake_popen)
+
+    result = eap_auth_test.execute_eapol_test(config, "eap_md5")
+
+    assert result.passed is False
+    assert Path(calls["command"][0]).is_absolute()
+    for disqualifying in ("preexec_fn", "start_new_session", "cwd", "pass_fds"):
+        assert disqualifying not in calls["kwargs"]
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda data: data["radius"].update(port="1812"),
+        lambda data: data["radius"].update(port=1812.0),
+        lambda data: data["radius"].update(timeout=5),
+        lambda data: data["eap_types"].update(eap_tls=[]),
+        lambda data: data.pop("eap_types"),
+    ],
+)
+def test_load_config_rejects_schema_violations(config_workspace: Path, mutate) -> None:
+    data = minimal_config()
+    mutate(data)
+    write_config(config_workspace, data)
+
+    with pytest.raises(SystemExit):
+        eap_auth_test.load_config()
+
+
+def test_section_validators_match_schema() -> None:
+    assert eap_auth_test.validate_radius_config(minimal_config()["radius"])
+    assert not eap_auth_test.validate_radius_config({"server": "127.0.0.1", "port": 1812})
+    assert eap_auth_test.validate_eap_types_config({"eap_md5": {}})
+    assert not eap_auth_test.validate_eap_types_config({"eap_md5": "MD5"})
+
+
+def test_run_with_retries_backs_off_then_succeeds(monkeypatch: pytest.MonkeyPatch) -> None:
+    attempts = []
+    delays = []
+
+    def fake_run(command, **kwargs):
+        attempts.append(command)
+        if len(attempts) < 3:
+            raise eap_auth_test.subprocess.CalledProcessError(100, command)
+        return SimpleNamespace(returncode=0)
 
     monkeypatch.setattr(eap_auth_test.subprocess, "run", fake_run)
+    monkeypatch.setattr(eap_auth_test.time, "sleep", delays.append)
 
-    eap_auth_test.execute_eapol_test(config, "eap_md5")
+    eap_auth_test.run_with_retries(["brew", "install", "openssl"])
 
-    assert calls["command"][0] == str(eap_auth_test.EAPOL_TEST_PATH)
-    assert any("test passed" in message.message for message in caplog.records)
+    assert len(attempts) == 3
+    assert delays == [eap_auth_test.INSTALL_RETRY_DELAY, eap_auth_test.INSTALL_RETRY_DELAY * 2]
+
+
+def test_run_with_retries_gives_up(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fake_run(command, **kwargs):
+        raise eap_auth_test.subprocess.CalledProcessError(100, command)
+
+    monkeypatch.setattr(eap_auth_test.subprocess, "run", fake_run)
+    monkeypatch.setattr(eap_auth_test.time, "sleep", lambda delay: None)
+
+    with pytest.raises(eap_auth_test.subprocess.CalledProcessError):
+        eap_auth_test.run_with_retries(["brew", "install", "openssl"])